@@ -1,10 +1,18 @@
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Literal
-from datetime import datetime
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, computed_field
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import orjson
+import secrets
+import time
 import uuid
 import logging
+import os
 
 # --- 🌍 SYSTEM LOGGING ---
 # In a distributed logistics network, visibility is survival.
@@ -15,7 +23,22 @@ logger = logging.getLogger("AgriLink-Neural-Core")
 # --- 🚀 NEURAL CORE INITIALIZATION ---
 # This isn't just an API; it's the digital backbone for food security.
 # Version 2.2 focuses on latency reduction for EDGE networks (2G/3G areas).
+# Responses are encoded with orjson (Rust) instead of the stdlib json encoder,
+# which keeps CPU time per request down on the feed-heavy read path.
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background flusher moving evicted listings into cold storage.
+    archiver = asyncio.create_task(_archive_worker())
+    yield
+    archiver.cancel()
+    with suppress(asyncio.CancelledError):
+        await archiver
+    await _flush_archive()
+
 app = FastAPI(
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     title="AgriLink Neural Dispatch API",
     description="High-performance logistics engine connecting Rural Supply to Urban Demand.",
     version="2.2.0"
@@ -37,6 +60,9 @@ app.add_middleware(
 # We use Pydantic to enforce data integrity. 
 # Bad data in a supply chain leads to rotten food. We don't allow that.
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
 class ListingRequest(BaseModel):
     farmer_id: str
     item_name: str
@@ -49,6 +75,17 @@ class BuyRequest(BaseModel):
     buyer_id: str
     listing_id: str
 
+def _humanize(age: timedelta) -> str:
+    """Compact relative age for the feed ("Just Now", "2m ago", "3h ago", "4d ago")."""
+    minutes = int(age.total_seconds() // 60)
+    if minutes < 1:
+        return "Just Now"
+    if minutes < 60:
+        return f"{minutes}m ago"
+    if minutes < 60 * 24:
+        return f"{minutes // 60}h ago"
+    return f"{minutes // (60 * 24)}d ago"
+
 class MarketListing(BaseModel):
     id: str
     item: str
@@ -57,11 +94,44 @@ class MarketListing(BaseModel):
     zone: str
     price: float
     seller: str
-    time: str
     type: Literal['supply', 'demand']
     
     # Auto-generated timestamp for analytics
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+
+    # Derived at serialization time so it never goes stale in storage.
+    @computed_field
+    @property
+    def time(self) -> str:
+        return _humanize(_utcnow() - self.created_at)
+
+class MarketListingLite(BaseModel):
+    """
+    Compact wire format for the default feed.
+    Single-letter keys and no timestamps keep payloads small on 2G/3G links.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: str = Field(alias="i")
+    item: str = Field(alias="n")
+    qty: float = Field(alias="q")
+    unit: str = Field(alias="u")
+    zone: str = Field(alias="z")
+    price: float = Field(alias="p")
+    seller: str = Field(alias="s")
+    type: Literal['supply', 'demand'] = Field(alias="t")
+
+# (field name, wire key) pairs taken from the model, so payload and schema can't drift.
+_LITE_KEYS: Tuple[Tuple[str, str], ...] = tuple(
+    (name, field.alias) for name, field in MarketListingLite.model_fields.items()
+)
+
+def _to_lite(m: MarketListing) -> Dict[str, Any]:
+    # MarketListingLite.model_dump(by_alias=True), minus building/validating a model.
+    return {alias: getattr(m, name) for name, alias in _LITE_KEYS}
+
+def _to_full(m: MarketListing) -> Dict[str, Any]:
+    return m.model_dump(mode="json")
 
 # --- 💾 IN-MEMORY STATE LAYER ---
 # ARCHITECTURAL NOTE:
@@ -71,7 +141,11 @@ class MarketListing(BaseModel):
 # ROADMAP: In a deployed environment, this is replaced by:
 # 1. Redis (Hot Cache) for the real-time feed.
 # 2. PostgreSQL (Persistent Storage) for ledger history.
-market_feed: List[MarketListing] = [
+#
+# Listings are keyed by id so the transaction path is an O(1) hash lookup,
+# while `feed_order` keeps the LIFO display order. Bought listings are only
+# dropped from the dict; their stale ids are swept out lazily on the next read.
+_seed_listings: List[MarketListing] = [
     MarketListing(
         id="1",
         item="Onions",
@@ -80,7 +154,7 @@ market_feed: List[MarketListing] = [
         zone="North-West (Kano)",
         price=8500,
         seller="Sani Farms",
-        time="2m ago",
+        created_at=_utcnow() - timedelta(minutes=2),
         type="supply"
     ),
     MarketListing(
@@ -91,7 +165,7 @@ market_feed: List[MarketListing] = [
         zone="Lagos", 
         price=65000, 
         seller="Mega Stores", 
-        time="10m ago", 
+        created_at=_utcnow() - timedelta(minutes=10), 
         type="demand"
     ),
     MarketListing(
@@ -102,11 +176,65 @@ market_feed: List[MarketListing] = [
         zone="Benue",
         price=1200,
         seller="Mama Nkechi",
-        time="45m ago",
+        created_at=_utcnow() - timedelta(minutes=45),
         type="supply"
     )
 ]
 
+market_feed: Dict[str, MarketListing] = {listing.id: listing for listing in _seed_listings}
+
+# The feed is capped so RAM stays bounded under sustained harvest signals.
+# When full, the oldest listing is evicted to an archive queue that a
+# background task flushes in batches to cold storage (JSON lines for now,
+# PostgreSQL on the roadmap). The queue is capped too: if cold storage is
+# down long enough to fill it, further evictions are dropped and logged.
+MARKET_FEED_MAXLEN = 10_000
+ARCHIVE_QUEUE_MAXSIZE = 50_000
+ARCHIVE_PATH = os.getenv("AGRILINK_ARCHIVE_PATH", "market_archive.jsonl")
+ARCHIVE_FLUSH_INTERVAL_SECONDS = 0.5
+
+feed_order: Deque[str] = deque((listing.id for listing in _seed_listings), maxlen=MARKET_FEED_MAXLEN)
+_archive_queue: "asyncio.Queue[MarketListing]" = asyncio.Queue(maxsize=ARCHIVE_QUEUE_MAXSIZE)
+
+# Serialized feed per view (build time, bytes), rebuilt on the first read after
+# any write. Reads vastly outnumber writes, so most GETs are a straight bytes send.
+# The full view also expires after a TTL so its relative "time" labels stay
+# roughly current; the lite view has no time-dependent fields.
+FEED_CACHE_TTL_SECONDS = 30.0
+_feed_cache: Dict[str, Tuple[float, bytes]] = {}
+
+def _queue_for_archive(listing: MarketListing) -> None:
+    try:
+        _archive_queue.put_nowait(listing)
+    except asyncio.QueueFull:
+        logger.error(f"Archive queue full; dropping evicted listing {listing.id}")
+
+def _append_archive(batch: List[MarketListing]) -> None:
+    # The relative "time" label would be stale on disk; created_at is the record.
+    with open(ARCHIVE_PATH, "ab") as archive:
+        archive.writelines(orjson.dumps(m.model_dump(mode="json", exclude={"time"})) + b"\n" for m in batch)
+
+async def _flush_archive() -> None:
+    batch = []
+    while not _archive_queue.empty():
+        batch.append(_archive_queue.get_nowait())
+    if not batch:
+        return
+    try:
+        await asyncio.to_thread(_append_archive, batch)
+    except Exception:
+        # Keep the batch for the next cycle rather than losing it.
+        logger.exception(f"Archive flush to {ARCHIVE_PATH} failed; requeueing {len(batch)} listings")
+        for listing in batch:
+            _queue_for_archive(listing)
+        return
+    logger.info(f"Archived {len(batch)} evicted listings to {ARCHIVE_PATH}")
+
+async def _archive_worker() -> None:
+    while True:
+        await asyncio.sleep(ARCHIVE_FLUSH_INTERVAL_SECONDS)
+        await _flush_archive()
+
 # --- 📡 ENDPOINTS ( The Neural Interface ) ---
 
 @app.get("/")
@@ -116,15 +244,37 @@ async def health_check():
     Verifies that the Neural Core is online and ready to process vectors.
     """
     logger.info("Health check ping received.")
-    return {"status": "neural_link_active", "timestamp": datetime.utcnow().isoformat(), "region": "West-Africa-1"}
+    return {"status": "neural_link_active", "timestamp": _utcnow().isoformat(), "region": "West-Africa-1"}
+
+def _serve_feed(
+    view: str, project: Callable[[MarketListing], Dict[str, Any]], ttl: Optional[float] = None
+) -> Response:
+    global feed_order
+    now = time.monotonic()
+    cached = _feed_cache.get(view)
+    if cached is None or (ttl is not None and now - cached[0] > ttl):
+        # Sweep out ids of listings that were dispatched since the last read.
+        if len(feed_order) != len(market_feed):
+            feed_order = deque((i for i in feed_order if i in market_feed), maxlen=feed_order.maxlen)
+        cached = _feed_cache[view] = (now, orjson.dumps([project(market_feed[i]) for i in feed_order]))
+    return Response(content=cached[1], media_type="application/json")
 
-@app.get("/market/feed", response_model=List[MarketListing])
+@app.get("/market/feed", responses={200: {"model": List[MarketListingLite]}})
 async def get_market_feed():
     """
     The Pulse of the Market.
-    Returns the real-time commodity board. Optimized for low-bandwidth JSON payload.
+    Returns the real-time commodity board. Optimized for low-bandwidth JSON payload:
+    short keys, no timestamps (see MarketListingLite).
+    """
+    return _serve_feed("lite", _to_lite)
+
+@app.get("/market/feed/full", responses={200: {"model": List[MarketListing]}})
+async def get_market_feed_full():
+    """
+    The Full Board.
+    Every listing field, including timestamps, for dashboards and admin tooling.
     """
-    return market_feed
+    return _serve_feed("full", _to_full, ttl=FEED_CACHE_TTL_SECONDS)
 
 @app.post("/market/create_listing", status_code=status.HTTP_201_CREATED)
 async def create_listing(request: ListingRequest):
@@ -146,12 +296,19 @@ async def create_listing(request: ListingRequest):
         zone=request.location_zone,
         price=request.price_total,
         seller=request.farmer_id, 
-        time="Just Now",
         type="supply"
     )
     
+    # Feed is full: retire the oldest entries (skipping already-dispatched ids).
+    while len(feed_order) == feed_order.maxlen:
+        evicted = market_feed.pop(feed_order.pop(), None)
+        if evicted is not None:
+            _queue_for_archive(evicted)
+
     # LIFO (Last In, First Out) - Newest harvest hits the top of the feed.
-    market_feed.insert(0, new_listing)
+    market_feed[new_id] = new_listing
+    feed_order.appendleft(new_id)
+    _feed_cache.clear()
     
     return {
         "status": "created",
@@ -167,8 +324,8 @@ async def buy_item(request: BuyRequest):
     """
     logger.info(f"Transaction Request: Buyer {request.buyer_id} -> Listing {request.listing_id}")
 
-    # Vector Search (Linear Scan for prototype)
-    listing = next((x for x in market_feed if x.id == request.listing_id), None)
+    # Direct hash lookup - no scan over the feed
+    listing = market_feed.get(request.listing_id)
     
     if not listing:
         raise HTTPException(status_code=404, detail="Asset not found. It may have already been dispatched.")
@@ -176,11 +333,13 @@ async def buy_item(request: BuyRequest):
     if listing.type != 'supply':
         raise HTTPException(status_code=400, detail="Protocol Error: Cannot purchase a Demand request.")
 
-    # Remove from feed to prevent double-spending/double-booking
-    market_feed.remove(listing)
+    # Remove from feed to prevent double-spending/double-booking.
+    # The id stays in `feed_order` until the next feed read sweeps it.
+    del market_feed[listing.id]
+    _feed_cache.clear()
     
     # Generate Dispatch Token
-    dispatch_id = f"TRUCK-{uuid.uuid4().hex[:6].upper()}"
+    dispatch_id = f"TRUCK-{secrets.token_hex(3).upper()}"
     
     return {
         "status": "success",
@@ -0,0 +1,83 @@
+import asyncio
+import importlib
+import os
+import tempfile
+import unittest
+from collections import deque
+
+import orjson
+
+import main
+
+
+class FeedEvictionArchiveTest(unittest.IsolatedAsyncioTestCase):
+    """Bounded hot feed: eviction into the archive queue and cold-storage flushes."""
+
+    def setUp(self):
+        importlib.reload(main)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.archive_path = os.path.join(self.tmp.name, "archive.jsonl")
+        main.ARCHIVE_PATH = self.archive_path
+        # Seed feed is ["1", "2", "3"]; cap it at its current size.
+        main.feed_order = deque(main.feed_order, maxlen=3)
+
+    async def _create(self, item):
+        result = await main.create_listing(main.ListingRequest(
+            farmer_id="farmer", item_name=item, quantity=1, location_zone="Kano", price_total=100,
+        ))
+        return result["listing_id"]
+
+    def _archived_rows(self):
+        with open(self.archive_path, "rb") as archive:
+            return [orjson.loads(line) for line in archive]
+
+    async def test_full_feed_evicts_oldest_live_listing_to_archive(self):
+        # Dispatching "3" leaves a stale id at the tail; eviction skips it.
+        await main.buy_item(main.BuyRequest(buyer_id="buyer", listing_id="3"))
+        first = await self._create("Maize")
+        self.assertEqual(main._archive_queue.qsize(), 0)
+
+        second = await self._create("Millet")
+        self.assertEqual(list(main.feed_order), [second, first, "1"])
+        self.assertEqual(set(main.market_feed), {second, first, "1"})
+        self.assertEqual(main._archive_queue.qsize(), 1)
+
+        await main._flush_archive()
+        rows = self._archived_rows()
+        self.assertEqual([row["id"] for row in rows], ["2"])
+        self.assertIn("created_at", rows[0])
+        self.assertNotIn("time", rows[0])
+        self.assertEqual(main._archive_queue.qsize(), 0)
+
+    async def test_failed_flush_keeps_batch_and_worker_alive(self):
+        await self._create("Maize")
+        main.ARCHIVE_PATH = os.path.join(self.tmp.name, "missing", "archive.jsonl")
+        main.ARCHIVE_FLUSH_INTERVAL_SECONDS = 0.01
+
+        with self.assertLogs(main.logger, level="ERROR"):
+            worker = asyncio.create_task(main._archive_worker())
+            await asyncio.sleep(0.05)
+        self.assertFalse(worker.done())
+        self.assertEqual(main._archive_queue.qsize(), 1)
+
+        main.ARCHIVE_PATH = self.archive_path
+        await asyncio.sleep(0.05)
+        worker.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await worker
+        self.assertEqual([row["id"] for row in self._archived_rows()], ["3"])
+        self.assertEqual(main._archive_queue.qsize(), 0)
+
+    async def test_full_archive_queue_drops_and_logs(self):
+        main._archive_queue = asyncio.Queue(maxsize=1)
+        await self._create("Maize")
+        with self.assertLogs(main.logger, level="ERROR") as logs:
+            await self._create("Millet")
+        self.assertIn("dropping evicted listing 2", logs.output[0])
+        self.assertEqual(main._archive_queue.qsize(), 1)
+        self.assertEqual(len(main.market_feed), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()